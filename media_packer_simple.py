@@ -7,14 +7,22 @@ Media Packer - 简化版种子生成工具
 
 
 import os
+import re
+import errno
+import bisect
 import sys
 import time
+import stat
+import shutil
 import logging
 import subprocess
 import json
+import importlib.util
+import site
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Sequence
 
 # 版本信息
 try:
@@ -25,31 +33,74 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
 # 依赖检查和自动安装
+REQUIRED_PACKAGES = {
+    # Removed torf dependency - using mktorrent instead
+    'click': 'click>=8.0.0', 
+    'rich': 'rich>=13.0.0',
+    'psutil': 'psutil>=5.8.0'  # 性能监控依赖
+}
+
+def _depcheck_sentinel() -> Optional[Path]:
+    """首次检查通过后写入的标记文件，之后启动不再逐项输出检查结果
+    
+    无法确定主目录时（如任意 UID 运行的容器）返回 None，不使用标记。
+    """
+    try:
+        cache_dir = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    except RuntimeError:
+        return None
+    return Path(cache_dir) / 'media_packer' / 'deps_ok'
+
+def _depcheck_stamp() -> str:
+    """标记内容：解释器路径 + 依赖版本要求，换用虚拟环境或依赖要求变化时标记自动失效"""
+    return sys.executable + '\n' + ' '.join(REQUIRED_PACKAGES.values()) + '\n'
+
+def _depcheck_marked() -> bool:
+    """当前环境是否已通过依赖检查"""
+    sentinel = _depcheck_sentinel()
+    if sentinel is None:
+        return False
+    try:
+        return sentinel.read_text(encoding='utf-8') == _depcheck_stamp()
+    except (OSError, UnicodeDecodeError):
+        return False
+
+def _mark_depcheck_passed() -> None:
+    """写入检查通过标记（主目录未知或缓存目录不可写时忽略）"""
+    sentinel = _depcheck_sentinel()
+    if sentinel is None:
+        return
+    try:
+        sentinel.parent.mkdir(parents=True, exist_ok=True)
+        sentinel.write_text(_depcheck_stamp(), encoding='utf-8')
+    except OSError:
+        pass
+
 def check_and_install_dependencies():
     """检查并自动安装依赖"""
-    required_packages = {
-        # Removed torf dependency - using mktorrent instead
-        'click': 'click>=8.0.0', 
-        'rich': 'rich>=13.0.0',
-        'psutil': 'psutil>=5.8.0'  # 性能监控依赖
-    }
+    # 部署环境已确认依赖完整时可跳过检查，加快启动
+    if os.environ.get('MEDIA_PACKER_SKIP_DEPCHECK') == '1':
+        return True
+    
+    # 已通过检查的环境只做静默的模块查找，依赖被卸载时标记失效并走完整流程
+    marked = _depcheck_marked()
     
     missing_packages = []
     
-    # 检查依赖
-    for package_name, package_spec in required_packages.items():
-        try:
-            __import__(package_name)
-            print(f"✓ {package_name} 已安装")
-        except ImportError:
-            missing_packages.append(package_spec)
+    # 检查依赖（只查找模块，不执行导入，psutil 等在实际使用时才加载）
+    for package_name, package_spec in REQUIRED_PACKAGES.items():
+        if importlib.util.find_spec(package_name) is not None:
+            if not marked:
+                print(f"✓ {package_name} 已安装")
+        else:
+            missing_packages.append((package_name, package_spec))
             print(f"✗ {package_name} 未安装")
     
     # 如果有缺失的包，询问是否自动安装
     if missing_packages:
         print(f"\n发现 {len(missing_packages)} 个缺失的依赖包:")
-        for pkg in missing_packages:
-            print(f"  - {pkg}")
+        for _, package_spec in missing_packages:
+            print(f"  - {package_spec}")
         
         # 在非交互环境中自动安装
         if not sys.stdin.isatty():
@@ -60,21 +111,33 @@ def check_and_install_dependencies():
         if install_choice in ['y', 'yes', '']:
             print("\n正在安装依赖...")
             try:
-                for package_spec in missing_packages:
-                    print(f"安装 {package_spec}...")
-                    result = subprocess.run([
-                        sys.executable, '-m', 'pip', 'install', package_spec
-                    ], capture_output=True, text=True)
-                    
-                    if result.returncode == 0:
-                        print(f"✓ {package_spec} 安装成功")
-                    else:
-                        print(f"✗ {package_spec} 安装失败: {result.stderr}")
-                        return False
+                # 一次 pip 调用安装全部缺失的包，共享解析器和启动开销
+                package_specs = [package_spec for _, package_spec in missing_packages]
+                print(f"安装 {' '.join(package_specs)}...")
+                result = subprocess.run([
+                    sys.executable, '-m', 'pip', 'install', *package_specs
+                ], capture_output=True, text=True)
+                
+                if result.returncode == 0:
+                    print(f"✓ {', '.join(package_specs)} 安装成功")
+                else:
+                    print(f"✗ 依赖安装失败: {result.stderr}")
+                    return False
                 
-                print("\n所有依赖安装完成！正在重新启动程序...")
-                # 重新启动脚本
-                os.execv(sys.executable, [sys.executable] + sys.argv)
+                # 刷新导入缓存，新安装的包可直接在当前进程中导入
+                importlib.invalidate_caches()
+                # 仅在用户 site-packages 启用时补入 pip 的 --user 回退目录（虚拟环境、python -s 下保持隔离）
+                if site.ENABLE_USER_SITE:
+                    user_site = site.getusersitepackages()
+                    if os.path.isdir(user_site) and user_site not in sys.path:
+                        site.addsitedir(user_site)
+                
+                if all(importlib.util.find_spec(name) is not None for name, _ in missing_packages):
+                    print("\n所有依赖安装完成！")
+                else:
+                    print("\n所有依赖安装完成！正在重新启动程序...")
+                    # 当前进程仍无法找到新包时才重新启动脚本
+                    os.execv(sys.executable, [sys.executable] + sys.argv)
                 
             except Exception as e:
                 print(f"安装依赖时出错: {e}")
@@ -87,6 +150,8 @@ def check_and_install_dependencies():
             print("sudo apt install mktorrent  # 或使用对应的包管理器")
             return False
     
+    if not marked:
+        _mark_depcheck_passed()
     return True
 
 # 检查并安装依赖
@@ -97,20 +162,184 @@ if not check_and_install_dependencies():
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.progress import track, Progress, SpinnerColumn, TextColumn
 from rich.prompt import Prompt, Confirm
 import click
 # Removed torf import - now using mktorrent command-line tool
 
+# 可选依赖：orjson（未安装时回退到标准库 json）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 设置控制台
 console = Console()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# ================= 工具函数 =================
+
+# 剧集编号识别模式（按优先级排列，模块加载时预编译）
+EPISODE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'e(\d+)',           # E01, e01
+    r'ep(\d+)',          # EP01, ep01
+    r'第(\d+)集',         # 第01集
+    r'第(\d+)话',         # 第01话
+    r'(\d+)\.mp4',       # 01.mp4
+    r'(\d+)\.mkv',       # 01.mkv
+    r'[^\d](\d{2,3})(?!\d)',  # 两到三位数字
+))
+
+# 季度识别模式
+SEASON_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r's(\d+)',           # S01, s01
+    r'season(\d+)',      # Season01
+    r'第(\d+)季',         # 第1季
+))
+
+# 片名搜索分词模式（支持中文和英文）
+SEARCH_WORD_PATTERN = re.compile(r'[\w\u4e00-\u9fff]+')
+
+# 菜单表格列定义（选项, 说明）
+MENU_COLUMNS = (("选项", "cyan"), ("说明", "white"))
+
+# 任务状态显示颜色
+TASK_STATUS_COLORS = {
+    'pending': 'yellow',
+    'processing': 'blue',
+    'completed': 'green',
+    'error': 'red'
+}
+
+@lru_cache(maxsize=4096)
+def _format_timestamp(timestamp: int, fmt: str) -> str:
+    """格式化时间戳（按整秒缓存，表格重绘时避免逐行 localtime/strftime）"""
+    return time.strftime(fmt, time.localtime(timestamp))
+
+def _json_dumps(data: Any) -> bytes:
+    """序列化为缩进 2 格的 UTF-8 JSON 字节串"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _json_loads(data: bytes) -> Any:
+    """从 UTF-8 JSON 字节串反序列化"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _build_menu_table(rows) -> Table:
+    """构建无表头的菜单表格，rows 为 (选项, 说明) 序列"""
+    table = Table(show_header=False, box=None)
+    for name, style in MENU_COLUMNS:
+        table.add_column(name, style=style)
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+def _ensure_dir(path: Path) -> None:
+    """确保目录存在；已存在时只需一次 stat，不再发起 mkdir"""
+    if not os.path.isdir(path):
+        path.mkdir(parents=True, exist_ok=True)
+
+# Linux FICLONE ioctl (linux/fs.h: _IOW(0x94, 9, int))，Btrfs/XFS 上创建写时复制副本
+FICLONE = 0x40049409
+
+@lru_cache(maxsize=None)
+def _load_clonefile():
+    """加载 macOS libc 中的 clonefile(2)，不可用时返回 None"""
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        clonefile = libc.clonefile
+    except (OSError, AttributeError):
+        return None
+    clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+    clonefile.restype = ctypes.c_int
+    return clonefile
+
+def _copy_file_fast(src: Path, dst: Path) -> None:
+    """复制文件 - 依次尝试写时复制（Linux reflink / macOS clonefile）与 copy_file_range，
+    不支持时回退到普通复制
+    
+    目标以独占方式创建，绝不覆盖已存在的文件（它可能是另一源文件的硬链接），
+    目标已存在时抛出 FileExistsError。
+    """
+    if sys.platform == 'darwin':
+        clonefile = _load_clonefile()
+        # APFS 上克隆文件，同时保留权限和时间戳；跨卷等失败时回退
+        if clonefile is not None:
+            if clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+                return
+            import ctypes
+            err = ctypes.get_errno()
+            if err == errno.EEXIST:
+                raise FileExistsError(err, os.strerror(err), str(dst))
+    
+    with open(src, 'rb') as fsrc, open(dst, 'xb') as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        
+        if hasattr(os, 'copy_file_range'):
+            import fcntl
+            try:
+                # 共享数据块，无论文件多大都只需修改元数据
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                remaining = 0
+            except OSError:
+                pass  # 文件系统不支持 reflink 或跨设备
+            
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            except OSError:
+                pass  # 跨文件系统或内核不支持时回退
+        
+        if remaining > 0:
+            # 回退到普通复制：从头重写本函数刚创建的目标文件
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+    
+    shutil.copystat(src, dst)
+
+def _iter_video_files(root: str, _visited: Optional[set] = None):
+    """递归遍历目录，产出视频文件的 os.DirEntry
+    
+    基于 os.scandir，直接使用 DirEntry 缓存的类型信息，
+    避免 rglob + is_file 对每个条目重复 stat。
+    
+    符号链接目录会被跟随。每个目录都 stat 一次并按 (st_dev, st_ino) 去重，
+    链接成环时不会无限递归，经由链接重复到达的目录只遍历一次；
+    设备号取自目录自身，媒体文件夹内挂载的其他文件系统也能正确区分。
+    去重范围仅限本次调用（即单个媒体文件夹）：链接到其他媒体文件夹的内容
+    会在两个文件夹中各统计一次。
+    """
+    if _visited is None:
+        root_stat = os.stat(root)
+        _visited = {(root_stat.st_dev, root_stat.st_ino)}
+    
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir():
+                dir_stat = entry.stat()
+                key = (dir_stat.st_dev, dir_stat.st_ino)
+                if key in _visited:
+                    continue
+                _visited.add(key)
+                yield from _iter_video_files(entry.path, _visited)
+            elif entry.is_file() and MediaProcessor.is_video_name(entry.name):
+                yield entry
+
 # ================= 数据模型 =================
 
-@dataclass
+@dataclass(frozen=True)
 class ProcessResult:
-    """处理结果"""
+    """处理结果（不可变；手写 __slots__ 以兼容 Python 3.8）"""
+    __slots__ = ('original_path', 'organized_path', 'file_type')
+    
     original_path: Path
     organized_path: Path
     file_type: str
@@ -139,11 +368,20 @@ class MediaProcessor:
     """媒体文件处理器"""
     
     VIDEO_EXTENSIONS = {'.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v'}
+    # 供 str.endswith 一次性匹配所有扩展名
+    VIDEO_EXTENSION_SUFFIXES = tuple(sorted(VIDEO_EXTENSIONS))
+    
+    @staticmethod
+    def is_video_name(name: str) -> bool:
+        """按文件名检查是否为视频文件（无需构造 Path）"""
+        name = name.lower()
+        # 与 Path.suffix 一致：".mkv" 这类隐藏文件没有扩展名
+        return name.endswith(MediaProcessor.VIDEO_EXTENSION_SUFFIXES) and name.rfind('.') > 0
     
     @staticmethod
     def is_video_file(file_path: Path) -> bool:
         """检查是否为视频文件"""
-        return file_path.suffix.lower() in MediaProcessor.VIDEO_EXTENSIONS
+        return MediaProcessor.is_video_name(file_path.name)
     
     @staticmethod
     def detect_media_type(file_path: Path) -> str:
@@ -154,11 +392,13 @@ class MediaProcessor:
     
     def analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """分析文件基本信息"""
-        if not file_path.exists():
-            raise FileNotFoundError(f"文件不存在: {file_path}")
+        # 直接 stat 一次，同时完成存在性检查和大小获取
+        try:
+            file_size = file_path.stat().st_size
+        except FileNotFoundError:
+            raise FileNotFoundError(f"文件不存在: {file_path}") from None
         
         file_type = self.detect_media_type(file_path)
-        file_size = file_path.stat().st_size
         
         return {
             'file_type': file_type,
@@ -169,8 +409,12 @@ class MediaProcessor:
 class FileOrganizer:
     """文件组织器"""
     
+    __slots__ = ('base_path', '_created_dirs')
+    
     def __init__(self, base_path: Path):
         self.base_path = base_path
+        # 已创建的目标目录，同一目录下的多个文件只需 mkdir 一次
+        self._created_dirs = set()
     
     def organize_file(self, file_path: Path, custom_name: Optional[str] = None) -> Path:
         """组织文件到指定结构"""
@@ -185,17 +429,24 @@ class FileOrganizer:
                 folder_name = file_path.name
             target_dir = self.base_path / folder_name
         
-        target_dir.mkdir(parents=True, exist_ok=True)
+        if target_dir not in self._created_dirs:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(target_dir)
         
         if file_path.is_file():
             target_file = target_dir / file_path.name
             if not target_file.exists():
-                # 创建硬链接或复制文件
+                # 创建硬链接或复制文件；目标在检查后被并行任务抢先创建时，
+                # 与串行路径一样直接返回已有目标，绝不覆盖
                 try:
                     target_file.hardlink_to(file_path)
+                except FileExistsError:
+                    pass
                 except OSError:
-                    import shutil
-                    shutil.copy2(file_path, target_file)
+                    try:
+                        _copy_file_fast(file_path, target_file)
+                    except FileExistsError:
+                        pass
             return target_file
         else:
             # 如果是目录，直接返回目标目录
@@ -204,6 +455,25 @@ class FileOrganizer:
 class TorrentCreator:
     """种子创建器"""
     
+    # 机械硬盘RAID优化的Piece Size分档：小于第 i 个阈值时使用 PIECE_SIZES[i]
+    PIECE_SIZE_THRESHOLDS = (
+        200 * 1024 * 1024,          # < 200MB
+        1 * 1024 * 1024 * 1024,     # < 1GB
+        4 * 1024 * 1024 * 1024,     # < 4GB
+        8 * 1024 * 1024 * 1024,     # < 8GB
+        20 * 1024 * 1024 * 1024,    # < 20GB
+        50 * 1024 * 1024 * 1024,    # < 50GB
+    )
+    PIECE_SIZES = (
+        1024 * 1024,        # 1MB - 小文件
+        2 * 1024 * 1024,    # 2MB - 中小文件，减少piece数量
+        4 * 1024 * 1024,    # 4MB - 4GB以下最优，平衡性能
+        8 * 1024 * 1024,    # 8MB - 中等文件
+        16 * 1024 * 1024,   # 16MB - 大文件
+        32 * 1024 * 1024,   # 32MB - 超大文件
+        16 * 1024 * 1024,   # 16MB - >= 50GB 巨大文件回到中等piece size
+    )
+    
     def __init__(self, config: Config):
         self.config = config
         # 添加缓存来存储已计算的值
@@ -212,25 +482,14 @@ class TorrentCreator:
     def _get_optimal_piece_size(self, total_size: int) -> int:
         """根据文件大小获取最优piece size - 机械硬盘RAID优化版本"""
         if not self.config.auto_optimize:
-            return self.config.piece_size if self.config.piece_size else 0
+            # 显式配置的 piece size 优先
+            if self.config.piece_size:
+                return self.config.piece_size
+            # 未配置时按内容大小取 2 的幂，使 piece 数量保持在 1000-2000 左右（256KB-32MB）
+            return 1 << max(18, min(25, total_size.bit_length() - 11))
         
         # 机械硬盘RAID优化的Piece Size配置 - 平衡I/O效率和内存使用
-        size_gb = total_size / (1024 * 1024 * 1024)
-        
-        if total_size < 200 * 1024 * 1024:  # < 200MB
-            return 1024 * 1024  # 1MB - 小文件
-        elif total_size < 1 * 1024 * 1024 * 1024:  # < 1GB
-            return 2 * 1024 * 1024  # 2MB - 中小文件，减少piece数量
-        elif total_size < 4 * 1024 * 1024 * 1024:  # < 4GB
-            return 4 * 1024 * 1024  # 4MB - 4GB以下最优，平衡性能
-        elif total_size < 8 * 1024 * 1024 * 1024:  # < 8GB  
-            return 8 * 1024 * 1024  # 8MB - 中等文件
-        elif total_size < 20 * 1024 * 1024 * 1024:  # < 20GB
-            return 16 * 1024 * 1024  # 16MB - 大文件
-        elif total_size < 50 * 1024 * 1024 * 1024:  # < 50GB  
-            return 32 * 1024 * 1024  # 32MB - 超大文件
-        else:  # >= 50GB
-            return 16 * 1024 * 1024  # 16MB - 巨大文件回到中等piece size
+        return self.PIECE_SIZES[bisect.bisect_right(self.PIECE_SIZE_THRESHOLDS, total_size)]
     
     def _get_optimal_workers(self) -> int:
         """获取最优工作线程数 - 自动检测CPU核心数并优化"""
@@ -276,16 +535,17 @@ class TorrentCreator:
             optimal_workers = max(2, optimal_workers // 2)
         
         # 添加内存限制检查
+        performance_mode = self.config.performance_mode
         try:
             memory = psutil.virtual_memory()
             # 如果内存小于4GB，限制线程数
             if memory.total < 4 * 1024 * 1024 * 1024:
                 optimal_workers = min(optimal_workers, 4)
             # 添加mktorrent特定参数优化
-            if hasattr(self.config, 'performance_mode') and self.config.performance_mode == 'aggressive':
+            if performance_mode == 'aggressive':
                 # 激进模式：更多线程，适用于高性能CPU + SSD
                 optimal_workers = min(optimal_workers + 4, 20)
-            elif hasattr(self.config, 'performance_mode') and self.config.performance_mode == 'conservative':
+            elif performance_mode == 'conservative':
                 # 保守模式：减少线程，适用于机械硬盘
                 optimal_workers = max(2, optimal_workers // 2)
             
@@ -305,8 +565,14 @@ class TorrentCreator:
             return self._cache[cache_key]
             
         total_size = 0
-        if content_path.is_file():
-            total_size = content_path.stat().st_size
+        try:
+            content_stat = content_path.stat()
+        except OSError:
+            content_stat = None
+        
+        # 单文件直接复用同一次 stat 的结果
+        if content_stat is not None and stat.S_ISREG(content_stat.st_mode):
+            total_size = content_stat.st_size
         else:
             for file_path in content_path.rglob('*'):
                 if file_path.is_file():
@@ -363,7 +629,6 @@ class TorrentCreator:
             console.print(f"[green]🚀 使用mktorrent进行高性能制种[/green]")
             
             # 如果检测到可能是机械硬盘环境，进一步优化
-            import os
             import platform
             
             # 尝试检测存储类型（这是启发式检测）
@@ -392,7 +657,7 @@ class TorrentCreator:
             console.print("")  # 空行分隔
             
             # 使用mktorrent创建种子文件
-            self._create_torrent_with_mktorrent(content_path, torrent_path, optimal_piece_size, optimal_workers)
+            self._create_torrent_with_mktorrent(content_path, torrent_path, optimal_piece_size, optimal_workers, total_size)
             
             console.print("")
             console.print(f"[green]✅ 种子创建成功: {torrent_path}[/green]")
@@ -406,9 +671,7 @@ class TorrentCreator:
         console.print("[cyan]🧠 开始内存制种...[/cyan]")
         
         import tempfile
-        import shutil
         import psutil
-        import math
         
         # 检查系统是否有足够内存
         memory = psutil.virtual_memory()
@@ -440,17 +703,16 @@ class TorrentCreator:
             console.print(f"[cyan]  🧩 Piece Size: {piece_size / (1024*1024):.1f} MB[/cyan]")
             
             # 使用mktorrent处理临时文件
-            self._create_torrent_with_mktorrent(temp_content_path, torrent_path, piece_size, 1)
+            self._create_torrent_with_mktorrent(temp_content_path, torrent_path, piece_size, 1, total_size)
             
             end_time = time.time()
             duration = end_time - start_time
             
             console.print(f"[green]✅ 内存制种完成 - 用时: {duration:.1f}s[/green]")
     
-    def _create_torrent_with_mktorrent(self, content_path: Path, torrent_path: Path, piece_size: int, threads: int) -> None:
+    def _create_torrent_with_mktorrent(self, content_path: Path, torrent_path: Path, piece_size: int, threads: int,
+                                       total_size: Optional[int] = None) -> None:
         """使用mktorrent命令行工具创建种子"""
-        import subprocess
-        import time
         from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeElapsedColumn
         
         # 构建mktorrent命令
@@ -529,8 +791,9 @@ class TorrentCreator:
                 duration = end_time - start_time
                 
                 if return_code == 0:
-                    # 计算性能数据
-                    total_size = self._calculate_total_size(content_path)
+                    # 计算性能数据（调用方已统计过大小时直接复用）
+                    if total_size is None:
+                        total_size = self._calculate_total_size(content_path)
                     throughput = (total_size / (1024**2)) / duration if duration > 0 else 0
                     
                     progress.update(task, description=f"[green]mktorrent 制种完成[/green]")
@@ -573,7 +836,7 @@ class MediaPacker:
         self.torrent_creator = TorrentCreator(config)
         
         # 确保输出目录存在
-        self.config.output_dir.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(self.config.output_dir)
     
     def process_file(self, file_path: Path, organize: bool = False, custom_name: Optional[str] = None) -> ProcessResult:
         """处理单个文件"""
@@ -624,17 +887,23 @@ class MediaPacker:
         
         return torrent_path
     
-    def batch_process(self, file_paths: List[Path], torrent_name: str) -> Path:
+    def batch_process(self, file_paths: Sequence[Path], torrent_name: str) -> Path:
         """批量处理文件"""
+        from rich.progress import Progress
+        
         console.print(f"[cyan]批量处理 {len(file_paths)} 个文件[/cyan]")
         
         processed_paths = []
-        for file_path in track(file_paths, description="处理文件..."):
-            try:
-                result = self.process_file(file_path)
-                processed_paths.append(result.organized_path)
-            except Exception as e:
-                console.print(f"[red]处理失败 {file_path}: {e}[/red]")
+        # 限制刷新频率，文件很多且处理很快时避免界面刷新成为开销
+        with Progress(console=console, refresh_per_second=4, transient=True) as progress:
+            task_id = progress.add_task("处理文件...", total=len(file_paths))
+            for file_path in file_paths:
+                try:
+                    result = self.process_file(file_path)
+                    processed_paths.append(result.organized_path)
+                except Exception as e:
+                    progress.console.print(f"[red]处理失败 {file_path}: {e}[/red]")
+                progress.advance(task_id)
         
         # 创建批量种子
         if processed_paths:
@@ -657,23 +926,14 @@ class MediaPacker:
         if len(paths) == 1:
             return paths[0].parent if paths[0].is_file() else paths[0]
         
-        common_parts = None
-        for path in paths:
-            parts = path.parts
-            if common_parts is None:
-                common_parts = parts
-            else:
-                # 找到共同部分
-                common_length = 0
-                for i, (a, b) in enumerate(zip(common_parts, parts)):
-                    if a == b:
-                        common_length = i + 1
-                    else:
-                        break
-                common_parts = common_parts[:common_length]
+        try:
+            common = os.path.commonpath(paths)
+        except ValueError:
+            # 绝对路径与相对路径混用，或位于不同驱动器
+            common = ''
         
-        if common_parts:
-            return Path(*common_parts)
+        if common:
+            return Path(common)
         else:
             # 如果没有共同父目录，使用输出目录
             return self.config.output_dir
@@ -687,27 +947,31 @@ class ParallelMediaPacker(MediaPacker):
         super().__init__(config)
         self.lock = threading.Lock()  # 用于线程安全
     
-    def process_files_parallel(self, file_paths: List[Path], max_workers: int = 4) -> List[ProcessResult]:
-        """并行处理多个文件"""
-        results = []
+    def process_files_parallel(self, file_paths: List[Path], max_workers: int = 4,
+                               organize: bool = False) -> List[ProcessResult]:
+        """并行处理多个文件（结果按输入顺序返回）"""
+        if not file_paths:
+            return []
+        
+        results: List[Optional[ProcessResult]] = [None] * len(file_paths)
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # organize=True 时硬链接/复制以独占方式创建目标，同名文件不会互相覆盖
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as executor:
             # 提交所有任务
-            future_to_path = {
-                executor.submit(self.process_file, path): path 
-                for path in file_paths
+            future_to_index = {
+                executor.submit(self.process_file, path, organize): index
+                for index, path in enumerate(file_paths)
             }
             
             # 收集结果
-            for future in as_completed(future_to_path):
-                path = future_to_path[future]
+            for future in as_completed(future_to_index):
+                index = future_to_index[future]
                 try:
-                    result = future.result()
-                    results.append(result)
+                    results[index] = future.result()
                 except Exception as e:
-                    console.print(f"[red]处理失败 {path}: {e}[/red]")
+                    console.print(f"[red]处理失败 {file_paths[index]}: {e}[/red]")
         
-        return results
+        return [result for result in results if result is not None]
 
 # ================= 交互式界面 =================
 
@@ -721,25 +985,36 @@ class InteractiveMediaPacker:
         self.output_directory = None
         self.trackers = []
         self.task_queue = []
+        self._saved_snapshot = None  # 最近一次加载/保存时的配置快照
         
         # 加载配置
         self.load_config()
         
+    def _config_snapshot(self) -> tuple:
+        """当前可持久化配置的快照，用于判断是否需要写盘"""
+        return (tuple(self.media_directories), self.output_directory, tuple(self.trackers))
+    
     def load_config(self):
         """加载配置文件"""
         try:
-            if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                    self.media_directories = config_data.get('media_directories', [])
-                    self.output_directory = config_data.get('output_directory', None)
-                    self.trackers = config_data.get('trackers', [])
-                    self.console.print(f"[green]✓ 已加载配置文件: {self.config_file}[/green]")
+            with open(self.config_file, 'rb') as f:
+                config_data = _json_loads(f.read())
+            self.media_directories = config_data.get('media_directories', [])
+            self.output_directory = config_data.get('output_directory', None)
+            self.trackers = config_data.get('trackers', [])
+            self._saved_snapshot = self._config_snapshot()
+            self.console.print(f"[green]✓ 已加载配置文件: {self.config_file}[/green]")
+        except FileNotFoundError:
+            pass  # 首次运行，尚无配置文件
         except Exception as e:
             self.console.print(f"[yellow]加载配置文件失败: {e}[/yellow]")
     
     def save_config(self):
-        """保存配置文件"""
+        """保存配置文件（与磁盘内容一致时跳过写入）"""
+        snapshot = self._config_snapshot()
+        if snapshot == self._saved_snapshot:
+            return
+        
         try:
             config_data = {
                 'media_directories': self.media_directories,
@@ -747,8 +1022,9 @@ class InteractiveMediaPacker:
                 'trackers': self.trackers,
                 'saved_at': time.time()
             }
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=2)
+            with open(self.config_file, 'wb') as f:
+                f.write(_json_dumps(config_data))
+            self._saved_snapshot = snapshot
             self.console.print(f"[green]✓ 配置已保存: {self.config_file}[/green]")
         except Exception as e:
             self.console.print(f"[red]保存配置文件失败: {e}[/red]")
@@ -795,17 +1071,15 @@ class InteractiveMediaPacker:
         """显示主菜单"""
         self.console.print("\n[bold]主菜单[/bold]")
         
-        menu_table = Table(show_header=False, box=None)
-        menu_table.add_column("选项", style="cyan")
-        menu_table.add_column("说明", style="white")
-        
-        menu_table.add_row("1", "智能扫描媒体文件夹（支持片名搜索）")
-        menu_table.add_row("2", "查看处理队列")
-        menu_table.add_row("3", "开始处理")
-        menu_table.add_row("4", "制种性能测试")
-        menu_table.add_row("5", "设置")
-        menu_table.add_row("6", "快速配置向导")
-        menu_table.add_row("0", "退出")
+        menu_table = _build_menu_table((
+            ("1", "智能扫描媒体文件夹（支持片名搜索）"),
+            ("2", "查看处理队列"),
+            ("3", "开始处理"),
+            ("4", "制种性能测试"),
+            ("5", "设置"),
+            ("6", "快速配置向导"),
+            ("0", "退出"),
+        ))
         
         self.console.print(menu_table)
         
@@ -945,7 +1219,7 @@ class InteractiveMediaPacker:
     def _create_test_files(self) -> List[Path]:
         """创建性能测试文件"""
         test_dir = Path("./performance_test")
-        test_dir.mkdir(exist_ok=True)
+        _ensure_dir(test_dir)
         
         test_files = []
         test_sizes = [
@@ -954,6 +1228,8 @@ class InteractiveMediaPacker:
             (1000, "1GB")
         ]
         
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        
         self.console.print("\n[cyan]创建测试文件...[/cyan]")
         
         for size_mb, name in test_sizes:
@@ -1000,7 +1276,6 @@ class InteractiveMediaPacker:
             self.console.print(f"\n[cyan]测试文件: {test_file.name} ({file_size_mb:.0f} MB)[/cyan]")
             
             try:
-                import time
                 start_time = time.time()
                 
                 # 创建测试种子
@@ -1120,8 +1395,6 @@ class InteractiveMediaPacker:
     
     def _cleanup_test_files(self, test_files: List[Path]):
         """清理测试文件"""
-        import shutil
-        
         for test_file in test_files:
             try:
                 if test_file.exists():
@@ -1140,117 +1413,116 @@ class InteractiveMediaPacker:
     
     def _scan_media_folders(self, search_term: str = "") -> List[Dict]:
         """扫描媒体文件夹并分析内容"""
-        import re
-        from collections import defaultdict
-        
         media_folders = []
         processed_folders = set()  # 避免重复处理
         
-        for directory in self.media_directories:
-            dir_path = Path(directory)
-            if not dir_path.exists():
+        # 搜索条件只需预处理一次
+        search_lower = search_term.lower()
+        search_words = SEARCH_WORD_PATTERN.findall(search_lower)
+        
+        # 规范化后去重（保持配置顺序），同一目录重复配置时只遍历一次；
+        # 嵌套目录不合并，因为每个目录扫描的是它自己的直接子文件夹
+        directories = list(dict.fromkeys(
+            os.path.normpath(d) for d in self.media_directories
+        ))
+        if not directories:
+            return media_folders
+        
+        # 扫描以 I/O 为主，按目录并发进行；嵌套目录的重叠部分会被各自扫描，
+        # 合并时按文件夹路径去重
+        with ThreadPoolExecutor(max_workers=min(8, len(directories))) as executor:
+            scanned = executor.map(
+                lambda d: self._scan_media_directory(d, search_lower, search_words),
+                directories
+            )
+            for folder_infos in scanned:
+                for folder_info in folder_infos:
+                    if folder_info['folder_path'] in processed_folders:
+                        continue
+                    processed_folders.add(folder_info['folder_path'])
+                    media_folders.append(folder_info)
+        
+        # 按文件夹名称排序
+        media_folders.sort(key=lambda x: x['name'].lower())
+        return media_folders
+    
+    def _scan_media_directory(self, directory: str, search_lower: str,
+                              search_words: List[str]) -> List[Dict]:
+        """扫描单个媒体目录下的子文件夹（在线程池中执行）"""
+        media_folders = []
+        # 直接尝试打开目录，不存在时跳过（省去单独的 exists() 检查）
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError):
+            return media_folders
+        
+        # 遍历子目录寻找媒体文件夹（DirEntry 自带类型信息，无需逐个 stat）
+        for entry in entries:
+            if not entry.is_dir():
                 continue
-                
-            # 遍历子目录寻找媒体文件夹
-            for item in dir_path.iterdir():
-                if not item.is_dir() or item in processed_folders:
+            
+            item = Path(entry.path)
+            folder_name = entry.name
+            
+            # 如果有搜索条件，先按名称模糊匹配，不匹配则无需遍历文件
+            if search_lower:
+                folder_lower = folder_name.lower()
+                # 直接包含匹配，或分词匹配（支持中文和英文，至少有一个词匹配）
+                if not (search_lower in folder_lower or
+                        any(word in folder_lower for word in search_words)):
                     continue
+            
+            # 统计文件夹内的视频文件
+            video_files = []
+            file_sizes = []  # 与 video_files 一一对应，复用遍历时的 stat 结果
+            
+            try:
+                for video_entry in _iter_video_files(entry.path):
+                    video_files.append(Path(video_entry.path))
+                    file_sizes.append(video_entry.stat().st_size)
+            except (PermissionError, OSError):
+                continue
+            
+            # 如果文件夹包含视频文件
+            if video_files:
+                # 分析剧集信息
+                episode_info = self._analyze_episodes(video_files, file_sizes)
                 
-                processed_folders.add(item)
-                
-                # 统计文件夹内的视频文件
-                video_files = []
-                total_size = 0
-                
-                try:
-                    for file_path in item.rglob("*"):
-                        if file_path.is_file() and MediaProcessor.is_video_file(file_path):
-                            video_files.append(file_path)
-                            total_size += file_path.stat().st_size
-                except (PermissionError, OSError):
-                    continue
+                folder_info = {
+                    'name': folder_name,
+                    'path': str(item),
+                    'video_files': video_files,
+                    'episode_count': len(video_files),
+                    'total_size': sum(file_sizes),
+                    'episode_info': episode_info,
+                    'folder_path': item
+                }
                 
-                # 如果文件夹包含视频文件
-                if video_files:
-                    folder_name = item.name
-                    
-                    # 如果有搜索条件，进行模糊匹配
-                    if search_term:
-                        # 支持多种匹配方式
-                        search_lower = search_term.lower()
-                        folder_lower = folder_name.lower()
-                        
-                        # 直接包含匹配
-                        direct_match = search_lower in folder_lower
-                        
-                        # 分词匹配（支持中文和英文）
-                        search_words = re.findall(r'[\w\u4e00-\u9fff]+', search_lower)
-                        word_match = False
-                        if search_words:
-                            # 至少有一个词匹配就算匹配成功
-                            word_match = any(word in folder_lower for word in search_words)
-                        
-                        # 如果不匹配，跳过此文件夹
-                        if not (direct_match or word_match):
-                            continue
-                    
-                    # 分析剧集信息
-                    episode_info = self._analyze_episodes(video_files)
-                    
-                    folder_info = {
-                        'name': folder_name,
-                        'path': str(item),
-                        'video_files': video_files,
-                        'episode_count': len(video_files),
-                        'total_size': total_size,
-                        'episode_info': episode_info,
-                        'folder_path': item
-                    }
-                    
-                    media_folders.append(folder_info)
+                media_folders.append(folder_info)
         
-        # 按文件夹名称排序
-        media_folders.sort(key=lambda x: x['name'].lower())
         return media_folders
     
-    def _analyze_episodes(self, video_files: List[Path]) -> Dict:
+    def _analyze_episodes(self, video_files: List[Path], file_sizes: List[int]) -> Dict:
         """分析剧集信息"""
-        import re
-        
         episodes = []
         seasons = set()
         
-        for file_path in video_files:
+        for file_path, file_size in zip(video_files, file_sizes):
             filename = file_path.stem.lower()
             
             # 尝试提取剧集编号（支持多种格式）
-            episode_patterns = [
-                r'e(\d+)',           # E01, e01
-                r'ep(\d+)',          # EP01, ep01
-                r'第(\d+)集',         # 第01集
-                r'第(\d+)话',         # 第01话
-                r'(\d+)\.mp4',       # 01.mp4
-                r'(\d+)\.mkv',       # 01.mkv
-                r'[^\d](\d{2,3})(?!\d)',  # 两到三位数字
-            ]
-            
             episode_num = None
-            for pattern in episode_patterns:
-                match = re.search(pattern, filename)
+            for pattern in EPISODE_PATTERNS:
+                match = pattern.search(filename)
                 if match:
                     episode_num = int(match.group(1))
                     break
             
             # 尝试提取季度信息
-            season_patterns = [
-                r's(\d+)',           # S01, s01
-                r'season(\d+)',      # Season01
-                r'第(\d+)季',         # 第1季
-            ]
-            
             season_num = 1  # 默认第一季
-            for pattern in season_patterns:
-                match = re.search(pattern, filename)
+            for pattern in SEASON_PATTERNS:
+                match = pattern.search(filename)
                 if match:
                     season_num = int(match.group(1))
                     break
@@ -1261,7 +1533,8 @@ class InteractiveMediaPacker:
                 'file_path': file_path,
                 'episode_num': episode_num,
                 'season_num': season_num,
-                'filename': file_path.name
+                'filename': file_path.name,
+                'file_size': file_size
             })
         
         # 按剧集编号排序
@@ -1368,10 +1641,19 @@ class InteractiveMediaPacker:
         table.add_column("总大小", style="magenta", width=10)
         table.add_column("路径", style="dim", min_width=30)
         
+        # 统计信息在渲染行时一并累计，避免再遍历列表
+        total_episodes = 0
+        total_size = 0
+        total_missing = 0
+        
         for i, folder in enumerate(media_folders, 1):
             size_gb = folder['total_size'] / (1024**3)
             episode_info = folder['episode_info']
             
+            total_episodes += episode_info['total_count']
+            total_size += folder['total_size']
+            total_missing += len(episode_info['episode_ranges']['missing'])
+            
             # 格式化大小显示
             if size_gb >= 1:
                 size_str = f"{size_gb:.1f} GB"
@@ -1398,11 +1680,7 @@ class InteractiveMediaPacker:
         
         # 显示统计信息
         total_folders = len(media_folders)
-        total_episodes = sum(folder['episode_info']['total_count'] for folder in media_folders)
-        total_size_gb = sum(folder['total_size'] for folder in media_folders) / (1024**3)
-        
-        # 统计缺失剧集
-        total_missing = sum(len(folder['episode_info']['episode_ranges']['missing']) for folder in media_folders)
+        total_size_gb = total_size / (1024**3)
         
         stats_text = (
             f"[bold]统计信息[/bold]\n"
@@ -1427,15 +1705,13 @@ class InteractiveMediaPacker:
             return
         
         self.console.print("\n[bold]操作选项[/bold]")
-        action_table = Table(show_header=False, box=None)
-        action_table.add_column("选项", style="cyan")
-        action_table.add_column("说明", style="white")
-        
-        action_table.add_row("1", "查看指定文件夹的详细信息")
-        action_table.add_row("2", "将指定文件夹添加到处理队列")
-        action_table.add_row("3", "将所有文件夹添加到处理队列")
-        action_table.add_row("4", "批量选择文件夹添加到队列")
-        action_table.add_row("0", "返回")
+        action_table = _build_menu_table((
+            ("1", "查看指定文件夹的详细信息"),
+            ("2", "将指定文件夹添加到处理队列"),
+            ("3", "将所有文件夹添加到处理队列"),
+            ("4", "批量选择文件夹添加到队列"),
+            ("0", "返回"),
+        ))
         
         self.console.print(action_table)
         
@@ -1497,7 +1773,7 @@ class InteractiveMediaPacker:
             episode_table.add_column("大小", style="magenta")
             
             for ep in episode_info['episodes'][:20]:  # 最多显示20集
-                size_mb = ep['file_path'].stat().st_size / (1024**2)
+                size_mb = ep['file_size'] / (1024**2)
                 
                 episode_num_str = str(ep['episode_num']) if ep['episode_num'] else "未知"
                 
@@ -1613,7 +1889,7 @@ class InteractiveMediaPacker:
         for i, task in enumerate(self.task_queue[:20], 1):  # 显示前20个
             if task.get('is_folder', False):
                 # 文件夹任务
-                name = task.get('folder_name', Path(task['file_path']).name)
+                name = task.get('folder_name') or Path(task['file_path']).name
                 task_type = "文件夹"
                 episode_info = f"{task.get('episode_count', 0)} 集"
             else:
@@ -1623,12 +1899,7 @@ class InteractiveMediaPacker:
                 task_type = "文件"
                 episode_info = "-"
             
-            status_color = {
-                'pending': 'yellow',
-                'processing': 'blue',
-                'completed': 'green',
-                'error': 'red'
-            }.get(task['status'], 'white')
+            status_color = TASK_STATUS_COLORS.get(task['status'], 'white')
             
             table.add_row(
                 str(i),
@@ -1636,7 +1907,7 @@ class InteractiveMediaPacker:
                 task_type,
                 episode_info,
                 f"[{status_color}]{task['status']}[/{status_color}]",
-                time.strftime("%H:%M", time.localtime(task['added_at']))
+                _format_timestamp(int(task['added_at']), "%H:%M")
             )
         
         if len(self.task_queue) > 20:
@@ -1644,10 +1915,14 @@ class InteractiveMediaPacker:
         
         self.console.print(table)
         
-        # 显示队列统计
-        total_folders = sum(1 for task in self.task_queue if task.get('is_folder', False))
+        # 显示队列统计（单次遍历）
+        total_folders = 0
+        total_episodes = 0
+        for task in self.task_queue:
+            if task.get('is_folder', False):
+                total_folders += 1
+            total_episodes += task.get('episode_count', 1)
         total_files = len(self.task_queue) - total_folders
-        total_episodes = sum(task.get('episode_count', 1) for task in self.task_queue)
         
         stats_panel = Panel(
             f"[bold]队列统计[/bold]\n"
@@ -1661,14 +1936,12 @@ class InteractiveMediaPacker:
         
         # 队列操作
         self.console.print("\n[bold]队列操作[/bold]")
-        action_table = Table(show_header=False, box=None)
-        action_table.add_column("选项", style="cyan")
-        action_table.add_column("说明", style="white")
-        
-        action_table.add_row("1", "清空队列")
-        action_table.add_row("2", "删除指定任务")
-        action_table.add_row("3", "查看任务详情")
-        action_table.add_row("0", "返回")
+        action_table = _build_menu_table((
+            ("1", "清空队列"),
+            ("2", "删除指定任务"),
+            ("3", "查看任务详情"),
+            ("0", "返回"),
+        ))
         
         self.console.print(action_table)
         
@@ -1698,7 +1971,7 @@ class InteractiveMediaPacker:
             task_num = int(Prompt.ask(f"请输入要删除的任务序号 (1-{len(self.task_queue)})")) - 1
             if 0 <= task_num < len(self.task_queue):
                 removed_task = self.task_queue.pop(task_num)
-                name = removed_task.get('folder_name', Path(removed_task['file_path']).name)
+                name = removed_task.get('folder_name') or Path(removed_task['file_path']).name
                 self.console.print(f"[green]已删除任务: {name}[/green]")
             else:
                 self.console.print("[red]无效的序号[/red]")
@@ -1723,7 +1996,7 @@ class InteractiveMediaPacker:
                         f"[bold]路径:[/bold] {task['file_path']}\n"
                         f"[bold]剧集数:[/bold] {task.get('episode_count', 0)} 集\n"
                         f"[bold]状态:[/bold] {task['status']}\n"
-                        f"[bold]添加时间:[/bold] {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(task['added_at']))}"
+                        f"[bold]添加时间:[/bold] {_format_timestamp(int(task['added_at']), '%Y-%m-%d %H:%M:%S')}"
                     )
                 else:
                     # 单文件任务详情
@@ -1733,7 +2006,7 @@ class InteractiveMediaPacker:
                         f"[bold]文件名:[/bold] {file_path.name}\n"
                         f"[bold]路径:[/bold] {task['file_path']}\n"
                         f"[bold]状态:[/bold] {task['status']}\n"
-                        f"[bold]添加时间:[/bold] {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(task['added_at']))}"
+                        f"[bold]添加时间:[/bold] {_format_timestamp(int(task['added_at']), '%Y-%m-%d %H:%M:%S')}"
                     )
                 
                 # 添加错误信息（如果有）
@@ -1787,56 +2060,13 @@ class InteractiveMediaPacker:
         success_count = 0
         error_count = 0
         
+        # 逐个处理：制种过程中可能出现交互式确认，且 mktorrent 本身已多线程，
+        # 并发多个任务只会加剧磁盘争用
         for i, task in enumerate(pending_tasks, 1):
-            try:
-                task['status'] = 'processing'
-                
-                file_path = Path(task['file_path'])
-                
-                if task.get('is_folder', False):
-                    # 处理文件夹任务
-                    folder_name = task.get('folder_name', file_path.name)
-                    
-                    self.console.print(f"\n[cyan]📁 开始制种 ({i}/{len(pending_tasks)}): {folder_name} ({task.get('episode_count', 0)} 集)[/cyan]")
-                    
-                    # 直接为文件夹创建种子（不重复打印）
-                    torrent_path = packer.create_torrent_for_file(
-                        file_path,
-                        custom_name=folder_name,
-                        organize=False  # 文件夹已经是组织好的
-                    )
-                    
-                else:
-                    # 处理单文件任务
-                    file_name = file_path.name
-                    
-                    self.console.print(f"\n[cyan]📄 开始制种 ({i}/{len(pending_tasks)}): {file_name}[/cyan]")
-                    
-                    # 获取文件夹名称（不重复打印）
-                    if file_path.is_file():
-                        folder_name = file_path.parent.name
-                    else:
-                        folder_name = file_path.name
-                    
-                    # 创建种子
-                    torrent_path = packer.create_torrent_for_file(
-                        file_path,
-                        custom_name=folder_name,
-                        organize=True
-                    )
-                
-                task['status'] = 'completed'
-                task['completed_at'] = time.time()
-                task['torrent_path'] = str(torrent_path)
+            if self._run_one_task(task, packer, i, len(pending_tasks)):
                 success_count += 1
-                
-                self.console.print(f"[green]✅ 完成: {torrent_path.name}[/green]")
-                
-            except Exception as e:
-                task['status'] = 'error'
-                task['error_message'] = str(e)
+            else:
                 error_count += 1
-                self.console.print(f"[red]❌ 错误: {e}[/red]")
         
         # 显示处理结果
         result_text = (
@@ -1861,6 +2091,58 @@ class InteractiveMediaPacker:
         
         input("按回车键继续...")
     
+    def _run_one_task(self, task: Dict, packer: MediaPacker, index: int, total: int) -> bool:
+        """处理单个队列任务，更新任务状态；成功返回 True"""
+        try:
+            task['status'] = 'processing'
+            
+            file_path = Path(task['file_path'])
+            
+            if task.get('is_folder', False):
+                # 处理文件夹任务
+                folder_name = task.get('folder_name', file_path.name)
+                
+                self.console.print(f"\n[cyan]📁 开始制种 ({index}/{total}): {folder_name} ({task.get('episode_count', 0)} 集)[/cyan]")
+                
+                # 直接为文件夹创建种子（不重复打印）
+                torrent_path = packer.create_torrent_for_file(
+                    file_path,
+                    custom_name=folder_name,
+                    organize=False  # 文件夹已经是组织好的
+                )
+            
+            else:
+                # 处理单文件任务
+                file_name = file_path.name
+                
+                self.console.print(f"\n[cyan]📄 开始制种 ({index}/{total}): {file_name}[/cyan]")
+                
+                # 获取文件夹名称（不重复打印）
+                if file_path.is_file():
+                    folder_name = file_path.parent.name
+                else:
+                    folder_name = file_path.name
+                
+                # 创建种子
+                torrent_path = packer.create_torrent_for_file(
+                    file_path,
+                    custom_name=folder_name,
+                    organize=True
+                )
+            
+            task['status'] = 'completed'
+            task['completed_at'] = time.time()
+            task['torrent_path'] = str(torrent_path)
+            
+            self.console.print(f"[green]✅ 完成: {torrent_path.name}[/green]")
+            return True
+        
+        except Exception as e:
+            task['status'] = 'error'
+            task['error_message'] = str(e)
+            self.console.print(f"[red]❌ 错误: {e}[/red]")
+            return False
+    
     def _show_generated_torrents(self):
         """显示生成的种子文件列表"""
         completed_tasks = [t for t in self.task_queue if t['status'] == 'completed']
@@ -1885,9 +2167,9 @@ class InteractiveMediaPacker:
                 source_name = Path(task['file_path']).name
                 task_type = "文件"
             
-            completed_time = time.strftime(
-                "%m-%d %H:%M",
-                time.localtime(task.get('completed_at', task['added_at']))
+            completed_time = _format_timestamp(
+                int(task.get('completed_at', task['added_at'])),
+                "%m-%d %H:%M"
             )
             
             table.add_row(
@@ -1904,15 +2186,13 @@ class InteractiveMediaPacker:
         while True:
             self.console.print("\n[bold]设置[/bold]")
             
-            settings_table = Table(show_header=False, box=None)
-            settings_table.add_column("选项", style="cyan")
-            settings_table.add_column("说明", style="white")
-            
-            settings_table.add_row("1", "媒体目录设置")
-            settings_table.add_row("2", "输出目录设置")
-            settings_table.add_row("3", "Tracker 设置")
-            settings_table.add_row("4", "查看当前配置")
-            settings_table.add_row("0", "返回主菜单")
+            settings_table = _build_menu_table((
+                ("1", "媒体目录设置"),
+                ("2", "输出目录设置"),
+                ("3", "Tracker 设置"),
+                ("4", "查看当前配置"),
+                ("0", "返回主菜单"),
+            ))
             
             self.console.print(settings_table)
             
@@ -2040,11 +2320,14 @@ class InteractiveMediaPacker:
         # 步骤2：设置输出目录
         if not self.output_directory:
             self.console.print("\n[yellow]步骤 2/3: 设置输出目录[/yellow]")
-            directory = Prompt.ask("输出目录路径", default="./output")
-            
-            directory_path = Path(directory)
-            if not directory_path.exists():
-                directory_path.mkdir(parents=True, exist_ok=True)
+            while True:
+                directory = Prompt.ask("输出目录路径", default="./output")
+                try:
+                    _ensure_dir(Path(directory))
+                    break
+                except OSError as e:
+                    # 路径已存在但不是目录，或无法创建时重新输入
+                    self.console.print(f"[red]无法使用该目录 {directory}: {e}[/red]")
             
             self.output_directory = directory
             self.console.print(f"[green]✓ 输出目录已设置: {directory}[/green]")
@@ -2089,8 +2372,8 @@ def cli(ctx, config):
     ctx.obj['packer'] = MediaPacker(default_config)
 
 @cli.command()
-@click.argument('input_path', type=click.Path(exists=True))
-@click.option('--output', '-o', type=click.Path(), help='输出目录')
+@click.argument('input_path', type=click.Path(exists=True, path_type=Path))
+@click.option('--output', '-o', type=click.Path(path_type=Path), help='输出目录')
 @click.option('--organize', is_flag=True, help='组织文件结构')
 @click.option('--name', '-n', help='种子名称（默认使用文件夹名称）')
 @click.pass_context
@@ -2099,23 +2382,21 @@ def pack(ctx, input_path, output, organize, name):
     packer = ctx.obj['packer']
     
     if output:
-        packer.config.output_dir = Path(output)
-        packer.file_organizer.base_path = Path(output)
+        packer.config.output_dir = output
+        packer.file_organizer.base_path = output
     
     try:
-        input_file = Path(input_path)
-        
         # 如果没有指定名称，使用文件夹名称
         if not name:
-            if input_file.is_file():
-                name = input_file.parent.name
+            if input_path.is_file():
+                name = input_path.parent.name
             else:
-                name = input_file.name
+                name = input_path.name
         
         console.print(f"[cyan]种子文件名将使用: {name}[/cyan]")
         
         torrent_path = packer.create_torrent_for_file(
-            input_file,
+            input_path,
             custom_name=name,
             organize=organize
         )
@@ -2125,8 +2406,8 @@ def pack(ctx, input_path, output, organize, name):
         raise click.ClickException(str(e))
 
 @cli.command()
-@click.argument('input_paths', nargs=-1, required=True, type=click.Path(exists=True))
-@click.option('--output', '-o', type=click.Path(), help='输出目录')
+@click.argument('input_paths', nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option('--output', '-o', type=click.Path(path_type=Path), help='输出目录')
 @click.option('--name', '-n', required=True, help='种子名称')
 @click.pass_context
 def batch(ctx, input_paths, output, name):
@@ -2134,19 +2415,18 @@ def batch(ctx, input_paths, output, name):
     packer = ctx.obj['packer']
     
     if output:
-        packer.config.output_dir = Path(output)
-        packer.file_organizer.base_path = Path(output)
+        packer.config.output_dir = output
+        packer.file_organizer.base_path = output
     
     try:
-        file_paths = [Path(p) for p in input_paths]
-        torrent_path = packer.batch_process(file_paths, name)
+        torrent_path = packer.batch_process(input_paths, name)
         console.print(f"[bold green]成功创建批量种子: {torrent_path}[/bold green]")
     except Exception as e:
         console.print(f"[bold red]错误: {e}[/bold red]")
         raise click.ClickException(str(e))
 
 @cli.command()
-@click.argument('torrent_path', type=click.Path(exists=True))
+@click.argument('torrent_path', type=click.Path(exists=True, path_type=Path))
 def info(torrent_path):
     """显示种子信息"""
     console.print("[red]种子信息功能已暂时禁用[/red]")
@@ -2155,8 +2435,8 @@ def info(torrent_path):
 
 
 @cli.command()
-@click.argument('torrent_path', type=click.Path(exists=True))
-@click.option('--content-path', '-c', type=click.Path(exists=True), help='原始内容路径（如果与种子中记录的不同）')
+@click.argument('torrent_path', type=click.Path(exists=True, path_type=Path))
+@click.option('--content-path', '-c', type=click.Path(exists=True, path_type=Path), help='原始内容路径（如果与种子中记录的不同）')
 @click.option('--verbose', '-v', is_flag=True, help='显示详细验证信息')
 def verify(torrent_path, content_path, verbose):
     """验证种子文件"""
@@ -2254,18 +2534,24 @@ if __name__ == '__main__':
     # 如果没有命令行参数，默认启动交互界面
     if len(sys.argv) == 1:
         try:
-            console.print("[green]启动 Media Packer 简化版交互式界面...[/green]")
-            console.print("[dim]提示: 使用 'python media_packer_simple.py --help' 查看命令行模式[/dim]\n")
+            console.print(
+                "[green]启动 Media Packer 简化版交互式界面...[/green]\n"
+                "[dim]提示: 使用 'python media_packer_simple.py --help' 查看命令行模式[/dim]\n"
+            )
             app = InteractiveMediaPacker()
             app.run()
         except KeyboardInterrupt:
             console.print("\n[yellow]程序被用户中断[/yellow]")
         except ImportError as e:
-            console.print(f"[red]缺少依赖: {e}[/red]")
-            console.print("[yellow]请运行: pip install torf click rich[/yellow]")
+            console.print(
+                f"[red]缺少依赖: {e}[/red]\n"
+                "[yellow]请运行: pip install torf click rich[/yellow]"
+            )
         except Exception as e:
-            console.print(f"[red]启动交互界面失败: {e}[/red]")
-            console.print("[yellow]尝试使用命令行模式: python media_packer_simple.py --help[/yellow]")
+            console.print(
+                f"[red]启动交互界面失败: {e}[/red]\n"
+                "[yellow]尝试使用命令行模式: python media_packer_simple.py --help[/yellow]"
+            )
     else:
         # 有命令行参数时运行CLI
         try: